@@ -3,11 +3,13 @@ import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from utils.rag_utils import search_similar
+from utils.rag_utils import search_similar, get_embedder, get_faiss_index, load_knowledge_base
 from utils.sentiment_analyzer import analyze_sentiment
 from utils.email_generator import generate_email_response
-from utils.ocr_utils import extract_text_from_image
+from utils.ocr_utils import extract_text_from_image, get_reader
 from utils.intent_classifier import classify_intent
+from utils.llm_client import get_model
+from utils.language_detector import get_ngram_model
 
 from database.db import init_db, create_ticket, add_message
 from dotenv import load_dotenv
@@ -23,6 +25,26 @@ def setup_environment() -> None:
     print("[INIT] Environment setup complete.")
 
 
+def warm_up_pipeline() -> None:
+    """
+    Loads embedder, FAISS index + KB, OCR reader, LLM client and (if available)
+    the language model up front so the first query doesn't pay for loading.
+    """
+    get_embedder()
+    get_faiss_index()
+    load_knowledge_base()
+    get_reader()
+    get_model()
+
+    # Optional: without it detect_language just falls back to the LLM
+    try:
+        get_ngram_model()
+    except Exception as e:
+        print(f"[LangDetect Error] Local detection disabled: {e}")
+
+    print("[INIT] Pipeline resources loaded.")
+
+
 def log_interaction(record: Dict[str, Any]) -> None:
     record_with_meta = {
         "timestamp": datetime.utcnow().isoformat(),
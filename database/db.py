@@ -5,6 +5,19 @@ from datetime import datetime
 DB_DIR = "database"
 DB_PATH = os.path.join(DB_DIR, "support.db")
 
+# Agent action that counts as an escalation in analytics
+ESCALATION_ACTION = "escalate_to_human_support"
+
+ROLLUP_DIMENSIONS = ("intent", "sentiment", "agent_action")
+
+# agent_action is excluded: its escalation rate is trivially 0 or 1
+ESCALATION_DIMENSIONS = ("intent", "sentiment")
+
+# Markers around matched terms in search snippets (control chars, so they
+# can't collide with message text or Markdown)
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
 
 def get_connection():
     os.makedirs(DB_DIR, exist_ok=True)
@@ -17,6 +30,9 @@ def init_db():
     conn = get_connection()
     cursor = conn.cursor()
 
+    # WAL lets readers run alongside a writer (concurrent API workers)
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     # Main ticket table
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS tickets (
@@ -41,11 +57,113 @@ def init_db():
     )
     """)
 
+    # Hourly analytics rollup (kept in sync by create_ticket)
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ticket_rollup_hourly'"
+    )
+    rollup_exists = cursor.fetchone() is not None
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ticket_rollup_hourly (
+        bucket_hour TEXT NOT NULL,
+        intent TEXT NOT NULL DEFAULT '',
+        sentiment TEXT NOT NULL DEFAULT '',
+        agent_action TEXT NOT NULL DEFAULT '',
+        ticket_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket_hour, intent, sentiment, agent_action)
+    )
+    """)
+
+    # Single-row write counter, bumped by every write (cache invalidation)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS db_changes (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        counter INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO db_changes (id, counter) VALUES (1, 0)")
+
+    # Full-text index over messages.message (external content, synced by triggers)
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+    )
+    fts_exists = cursor.fetchone() is not None
+
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        message,
+        content='messages',
+        content_rowid='msg_id'
+    )
+    """)
+
+    cursor.executescript("""
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, message) VALUES (new.msg_id, new.message);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, message)
+        VALUES ('delete', old.msg_id, old.message);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF message ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, message)
+        VALUES ('delete', old.msg_id, old.message);
+        INSERT INTO messages_fts(rowid, message) VALUES (new.msg_id, new.message);
+    END;
+    """)
+
+    # Migration: index messages written before the FTS table existed
+    if not fts_exists:
+        cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+    # Migration: roll up tickets written before the rollup table existed
+    if not rollup_exists:
+        _fill_rollups(cursor)
+
     conn.commit()
     conn.close()
     print("[DB] Initialized successfully!")
 
 
+def _bucket_hour(ts: str) -> str:
+    """
+    '2024-05-01T13:45:10.123' -> '2024-05-01T13:00:00'
+    """
+    return ts[:13] + ":00:00"
+
+
+def _bump_change_counter(cursor):
+    cursor.execute("UPDATE db_changes SET counter = counter + 1 WHERE id = 1")
+
+
+def get_change_counter() -> int:
+    """
+    Returns current write counter. Changes whenever a ticket or message
+    is written, so readers can use it as a cache key.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT counter FROM db_changes WHERE id = 1")
+    row = cursor.fetchone()
+    conn.close()
+    return row["counter"] if row else 0
+
+
+def _bump_rollup(cursor, ts, intent, sentiment, action):
+    cursor.execute(
+        """
+        INSERT INTO ticket_rollup_hourly
+            (bucket_hour, intent, sentiment, agent_action, ticket_count)
+        VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT (bucket_hour, intent, sentiment, agent_action)
+        DO UPDATE SET ticket_count = ticket_count + 1
+        """,
+        (_bucket_hour(ts), intent or "", sentiment or "", action or ""),
+    )
+
+
 def create_ticket(user_id, intent, sentiment, action):
     conn = get_connection()
     cursor = conn.cursor()
@@ -60,6 +178,8 @@ def create_ticket(user_id, intent, sentiment, action):
     )
 
     ticket_id = cursor.lastrowid
+    _bump_rollup(cursor, ts, intent, sentiment, action)
+    _bump_change_counter(cursor)
     conn.commit()
     conn.close()
     return ticket_id
@@ -77,6 +197,7 @@ def add_message(ticket_id, sender, message):
         """,
         (ticket_id, sender, message, ts),
     )
+    _bump_change_counter(cursor)
 
     conn.commit()
     conn.close()
@@ -100,6 +221,25 @@ def get_all_tickets():
     return [dict(row) for row in rows]
 
 
+def get_ticket(ticket_id: int):
+    """
+    Returns one ticket as dict, or None if it doesn't exist.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT ticket_id, user_id, intent, sentiment, agent_action, created_at
+        FROM tickets
+        WHERE ticket_id = ?
+        """,
+        (ticket_id,),
+    )
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
 def get_ticket_messages(ticket_id: int):
     """
     Returns list of dicts: all messages for one ticket.
@@ -118,3 +258,173 @@ def get_ticket_messages(ticket_id: int):
     rows = cursor.fetchall()
     conn.close()
     return [dict(row) for row in rows]
+
+
+def _fill_rollups(cursor):
+    cursor.execute("DELETE FROM ticket_rollup_hourly")
+    cursor.execute(
+        """
+        INSERT INTO ticket_rollup_hourly
+            (bucket_hour, intent, sentiment, agent_action, ticket_count)
+        SELECT substr(created_at, 1, 13) || ':00:00',
+               COALESCE(intent, ''),
+               COALESCE(sentiment, ''),
+               COALESCE(agent_action, ''),
+               COUNT(*)
+        FROM tickets
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+    return cursor.rowcount
+
+
+def backfill_rollups():
+    """
+    Rebuilds ticket_rollup_hourly from the tickets table.
+    init_db does this automatically when the rollup table is first created.
+    Returns number of rollup rows written.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    written = _fill_rollups(cursor)
+    _bump_change_counter(cursor)
+    conn.commit()
+    conn.close()
+    return written
+
+
+def _query_rollup(group_by: str, order_by: str, since: str | None):
+    """
+    Sums the rollup grouped by `group_by` (a trusted column name).
+    Each row gets tickets, escalations and escalation_rate.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT {group_by} AS value,
+               SUM(ticket_count) AS tickets,
+               SUM(CASE WHEN agent_action = ? THEN ticket_count ELSE 0 END)
+                   AS escalations
+        FROM ticket_rollup_hourly
+        WHERE bucket_hour >= ?
+        GROUP BY {group_by}
+        ORDER BY {order_by}
+        """,
+        (ESCALATION_ACTION, _bucket_hour(since) if since else ""),
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    results = []
+    for row in rows:
+        item = dict(row)
+        item["escalation_rate"] = (
+            item["escalations"] / item["tickets"] if item["tickets"] else 0.0
+        )
+        results.append(item)
+    return results
+
+
+def _check_dimension(dimension: str, allowed=ROLLUP_DIMENSIONS) -> None:
+    if dimension not in allowed:
+        raise ValueError(f"[DB] Unknown rollup dimension: {dimension}")
+
+
+def get_hourly_trends(since: str | None = None):
+    """
+    Returns list of dicts: ticket and escalation counts per hour bucket,
+    oldest first. `since` is an ISO timestamp (inclusive, hour-truncated).
+    """
+    trends = _query_rollup("bucket_hour", "bucket_hour ASC", since)
+    for item in trends:
+        item["bucket_hour"] = item.pop("value")
+    return trends
+
+
+def get_rollup_breakdown(dimension: str, since: str | None = None):
+    """
+    Returns list of dicts: ticket counts grouped by one of
+    intent / sentiment / agent_action, largest first.
+    """
+    _check_dimension(dimension)
+    return _query_rollup(dimension, "tickets DESC", since)
+
+
+def get_escalation_rates(dimension: str = "intent", since: str | None = None):
+    """
+    Returns list of dicts: escalation rate per intent or sentiment,
+    highest rate first (ties broken by ticket volume).
+    """
+    _check_dimension(dimension, ESCALATION_DIMENSIONS)
+    return _query_rollup(
+        dimension, "CAST(escalations AS REAL) / tickets DESC, tickets DESC", since
+    )
+
+
+def _fts_query(text: str) -> str:
+    """
+    Turns free text into a safe FTS5 query: every term is quoted so
+    order numbers / error strings (ORD-123, 0x80070005) are matched
+    literally instead of being parsed as FTS operators.
+    """
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"' for t in terms if t)
+
+
+def rebuild_search_index():
+    """
+    Rebuilds messages_fts from the messages table.
+    """
+    conn = get_connection()
+    conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+    _bump_change_counter(conn)
+    conn.commit()
+    conn.close()
+
+
+def search_messages(query: str, limit: int = 20, offset: int = 0):
+    """
+    Returns list of dicts: messages matching `query`, best match first
+    (bm25), with a snippet and the owning ticket id. Matched terms in the
+    snippet are wrapped in HIGHLIGHT_START / HIGHLIGHT_END.
+    """
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT m.msg_id, m.ticket_id, m.sender, m.timestamp,
+               snippet(messages_fts, 0, ?, ?, '…', 12) AS snippet,
+               bm25(messages_fts) AS rank
+        FROM messages_fts
+        JOIN messages m ON m.msg_id = messages_fts.rowid
+        WHERE messages_fts MATCH ?
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+        """,
+        (HIGHLIGHT_START, HIGHLIGHT_END, fts_query, limit, offset),
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m database.db backfill-rollups | rebuild-search-index
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "backfill-rollups":
+        init_db()
+        print(f"[DB] Rollups backfilled: {backfill_rollups()} buckets written.")
+    elif command == "rebuild-search-index":
+        init_db()
+        rebuild_search_index()
+        print("[DB] Search index rebuilt.")
+    else:
+        print("Usage: python -m database.db [backfill-rollups | rebuild-search-index]")
@@ -1,20 +1,22 @@
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-
-load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-# Latest Stable Model
-model = genai.GenerativeModel("gemini-2.5-flash")
+from utils.llm_client import get_model
+from utils.language_detector import detect_language_local, CONFIDENCE_THRESHOLD
 
 
 def detect_language(text: str) -> str:
     """
-    Detect language for first incoming user message
+    Detect language for first incoming user message.
+    Uses the local detector; only low-confidence text goes to Gemini.
     """
+    try:
+        local = detect_language_local(text)
+        if local["confidence"] >= CONFIDENCE_THRESHOLD:
+            return local["language"]
+    except Exception as e:
+        # Local model unavailable (e.g. training data missing) -> ask Gemini
+        print(f"[LangDetect Error] {e}")
+
     prompt = f"Detect language for this text. Respond only language name:\n{text}"
-    response = model.generate_content(prompt)
+    response = get_model().generate_content(prompt)
     return response.text.lower().strip()
 
 
@@ -57,5 +59,5 @@ Best Regards,
 GenSupport AI Support Team
 """
 
-    response = model.generate_content(prompt)
+    response = get_model().generate_content(prompt)
     return response.text.strip()
@@ -1,15 +1,5 @@
-import os
 import re
-from dotenv import load_dotenv
-import google.generativeai as genai
-
-# Load environment FIRST
-load_dotenv()
-
-# Configure Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-model = genai.GenerativeModel("gemini-2.5-flash")
+from utils.llm_client import get_model
 
 INTENT_OPTIONS = [
     "order_status",
@@ -35,7 +25,7 @@ Return ONLY the category word.
 """
 
     try:
-        response = model.generate_content(prompt)
+        response = get_model().generate_content(prompt)
         intent_raw = response.text.strip().lower()
         intent = re.sub(r"[^a-z_]", "", intent_raw)
 
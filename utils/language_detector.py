@@ -0,0 +1,202 @@
+import os
+import csv
+import math
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict
+
+# Anchored to the repo so the app can be launched from any working directory
+LANG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dataset", "lang")
+TRAIN_FILE = os.path.join(LANG_DIR, "train.csv")
+EVAL_FILE = os.path.join(LANG_DIR, "eval.csv")
+
+# Below this the caller should ask the LLM instead
+CONFIDENCE_THRESHOLD = 0.75
+
+NGRAM_SIZES = (1, 2, 3)
+SMOOTHING = 0.5
+
+# Texts with fewer n-grams than this (~3 short words) get damped confidence
+MIN_NGRAMS = 30
+
+DEVANAGARI = (0x0900, 0x097F)
+
+# Languages separated by the n-gram model (all written in Latin script)
+LATIN_LANGUAGES = ("english", "hinglish")
+
+
+def _is_devanagari(ch: str) -> bool:
+    return DEVANAGARI[0] <= ord(ch) <= DEVANAGARI[1]
+
+
+def _ngrams(text: str):
+    """
+    Character n-grams per word, padded with spaces so word starts/ends
+    ("nahi " / " mer") become features.
+    """
+    for word in re.findall(r"[a-z]+", text.lower()):
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+
+
+@lru_cache(maxsize=1)
+def get_ngram_model():
+    """
+    Builds per-language log-probabilities of character n-grams from the
+    small labelled corpus in dataset/lang/train.csv (once per process).
+    """
+    counts = {lang: Counter() for lang in LATIN_LANGUAGES}
+    with open(TRAIN_FILE, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["label"] in counts:
+                counts[row["label"]].update(_ngrams(row["text"]))
+
+    vocab = set().union(*counts.values())
+    model = {}
+    for lang, counter in counts.items():
+        total = sum(counter.values()) + SMOOTHING * (len(vocab) + 1)
+        model[lang] = {
+            "logprob": {g: math.log((c + SMOOTHING) / total) for g, c in counter.items()},
+            "unseen": math.log(SMOOTHING / total),
+        }
+    return model
+
+
+def _score_latin(text: str) -> Dict[str, float]:
+    grams = list(_ngrams(text))
+    if not grams:
+        return {}
+
+    model = get_ngram_model()
+    loglik = {
+        lang: sum(m["logprob"].get(g, m["unseen"]) for g in grams)
+        for lang, m in model.items()
+    }
+
+    # Temper by sqrt(#ngrams): n-grams overlap, so a plain sum is overconfident
+    temperature = math.sqrt(len(grams))
+    best = max(loglik.values())
+    exp = {lang: math.exp((ll - best) / temperature) for lang, ll in loglik.items()}
+    norm = sum(exp.values())
+
+    # "hi" / "ok" are too short to tell English from Hinglish reliably
+    support = min(1.0, len(grams) / MIN_NGRAMS)
+    return {lang: v / norm * support for lang, v in exp.items()}
+
+
+def detect_language_local(text: str) -> Dict:
+    """
+    Returns {"language", "confidence", "scores"} for english / hindi /
+    hinglish using script ranges plus a character n-gram model.
+    """
+    letters = [ch for ch in text if ch.isalpha()]
+    if not letters:
+        return {"language": "english", "confidence": 0.0, "scores": {}}
+
+    deva = sum(1 for ch in letters if _is_devanagari(ch))
+    latin = sum(1 for ch in letters if ch.isascii())
+    deva_ratio = deva / len(letters)
+    latin_ratio = latin / len(letters)
+
+    # Mostly Devanagari -> Hindi (English words like order numbers are fine)
+    if deva_ratio >= 0.5:
+        return {
+            "language": "hindi",
+            "confidence": deva_ratio,
+            "scores": {"hindi": deva_ratio},
+        }
+
+    scores = _score_latin(text)
+    if not scores:
+        return {"language": "english", "confidence": 0.0, "scores": {}}
+
+    # Scale by how much of the text is Latin at all (other scripts -> unsure)
+    scores = {lang: p * latin_ratio for lang, p in scores.items()}
+    if deva:
+        scores["hindi"] = deva_ratio
+
+    language = max(scores, key=scores.get)
+    return {"language": language, "confidence": scores[language], "scores": scores}
+
+
+def evaluate(eval_file: str = EVAL_FILE) -> Dict:
+    """
+    Accuracy + per-language accuracy of the local detector on the
+    labelled eval set, and how many rows would fall back to the LLM.
+    """
+    total, correct, fallbacks = 0, 0, 0
+    per_lang = {}
+    errors = []
+
+    with open(eval_file, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            result = detect_language_local(row["text"])
+            ok = result["language"] == row["label"]
+            total += 1
+            correct += ok
+            fallbacks += result["confidence"] < CONFIDENCE_THRESHOLD
+
+            hit, seen = per_lang.get(row["label"], (0, 0))
+            per_lang[row["label"]] = (hit + ok, seen + 1)
+            if not ok:
+                errors.append((row["text"], row["label"], result["language"], result["confidence"]))
+
+    return {
+        "total": total,
+        "accuracy": correct / total if total else 0.0,
+        "per_language": {lang: hit / seen for lang, (hit, seen) in per_lang.items()},
+        "llm_fallback_rate": fallbacks / total if total else 0.0,
+        "errors": errors,
+    }
+
+
+def benchmark(iterations: int = 200, eval_file: str = EVAL_FILE) -> Dict:
+    """
+    Per-call latency of detect_language_local over the eval texts
+    (model build excluded).
+    """
+    with open(eval_file, "r", encoding="utf-8") as f:
+        texts = [row["text"] for row in csv.DictReader(f)]
+
+    get_ngram_model()
+    timings = []
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            detect_language_local(text)
+            timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "mean_us": sum(timings) / len(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m utils.language_detector [eval | bench]
+    command = sys.argv[1] if len(sys.argv) > 1 else "eval"
+    if command == "eval":
+        report = evaluate()
+        print(f"[LangDetect] Accuracy: {report['accuracy']:.1%} on {report['total']} samples")
+        for lang, acc in report["per_language"].items():
+            print(f"  {lang:<9} {acc:.1%}")
+        print(f"  LLM fallback rate: {report['llm_fallback_rate']:.1%}")
+        for text, label, predicted, conf in report["errors"]:
+            print(f"  MISS [{label} -> {predicted} {conf:.2f}] {text}")
+    elif command == "bench":
+        stats = benchmark()
+        print(
+            f"[LangDetect] {stats['calls']} calls: mean {stats['mean_us']:.1f}us, "
+            f"p50 {stats['p50_us']:.1f}us, p99 {stats['p99_us']:.1f}us"
+        )
+    else:
+        print("Usage: python -m utils.language_detector [eval | bench]")
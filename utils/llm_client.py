@@ -0,0 +1,54 @@
+import os
+import time
+from functools import lru_cache
+from dotenv import load_dotenv
+import google.generativeai as genai
+
+# Latest Stable Model
+MODEL_NAME = "gemini-2.5-flash"
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Offline stand-in for the Gemini client (LLM_BACKEND=fake).
+    Returns canned answers based on the prompt, after an optional
+    simulated latency (FAKE_LLM_LATENCY_MS), so the pipeline can be
+    run and load-tested without an API key.
+    """
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        if "intent classifier" in prompt:
+            return FakeResponse("general_query")
+        if "Analyze the sentiment" in prompt:
+            return FakeResponse("neutral")
+        if prompt.startswith("Detect language"):
+            return FakeResponse("english")
+        return FakeResponse(
+            "Thank you for reaching out. We have received your request.\n\n"
+            "Best Regards,\nGenSupport AI Support Team"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_model():
+    """
+    Shared LLM client, created once per process.
+    """
+    load_dotenv()
+
+    if os.getenv("LLM_BACKEND", "gemini").lower() == "fake":
+        return FakeModel(latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")))
+
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai.GenerativeModel(MODEL_NAME)
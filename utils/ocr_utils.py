@@ -1,9 +1,14 @@
 import easyocr
 import os
+from functools import lru_cache
 
 
-# Initialize EasyOCR only once (performance boost)
-reader = easyocr.Reader(['en'], gpu=False)  # If GPU available then gpu=True
+@lru_cache(maxsize=1)
+def get_reader():
+    """
+    Initialize EasyOCR only once per process (performance boost).
+    """
+    return easyocr.Reader(['en'], gpu=False)  # If GPU available then gpu=True
 
 
 def extract_text_from_image(image_path: str) -> str:
@@ -14,7 +19,7 @@ def extract_text_from_image(image_path: str) -> str:
         raise FileNotFoundError(f"[OCR ERROR] Image not found: {image_path}")
 
     try:
-        result = reader.readtext(image_path, detail=0)  # detail=0 returns only text
+        result = get_reader().readtext(image_path, detail=0)  # detail=0 returns only text
         text_output = " ".join(result).strip()
 
         if not text_output:
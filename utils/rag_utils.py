@@ -3,9 +3,7 @@ import pandas as pd
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
-
-# Load embedding model
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+from functools import lru_cache
 
 KB_DIR = "dataset/kb/"
 FAISS_INDEX = "faiss_index.bin"
@@ -14,6 +12,14 @@ FAISS_INDEX = "faiss_index.bin"
 documents = []
 
 
+@lru_cache(maxsize=1)
+def get_embedder():
+    """
+    Load embedding model once per process.
+    """
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
 def load_knowledge_base():
     global documents
 
@@ -39,7 +45,7 @@ def create_faiss_index():
     if not documents:
         load_knowledge_base()
 
-    embeddings = embedder.encode(documents)
+    embeddings = get_embedder().encode(documents)
     dim = embeddings.shape[1]
 
     index = faiss.IndexFlatL2(dim)
@@ -54,13 +60,21 @@ def load_faiss_index():
     return faiss.read_index(FAISS_INDEX)
 
 
+@lru_cache(maxsize=1)
+def get_faiss_index():
+    """
+    Index read from disk once per process instead of on every search.
+    """
+    return load_faiss_index()
+
+
 def search_similar(query: str, top_k: int = 2):
-    index = load_faiss_index()
+    index = get_faiss_index()
 
     if not documents:
         load_knowledge_base()
 
-    query_vec = embedder.encode([query]).astype("float32")
+    query_vec = get_embedder().encode([query]).astype("float32")
     distances, indices = index.search(query_vec, top_k)
 
     results = []
@@ -1,11 +1,4 @@
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-
-load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-model = genai.GenerativeModel("gemini-2.5-flash")
+from utils.llm_client import get_model
 
 SENTIMENT_CATEGORIES = ["positive", "neutral", "negative"]
 
@@ -18,7 +11,7 @@ def analyze_sentiment(text: str) -> str:
     """
 
     try:
-        response = model.generate_content(prompt)
+        response = get_model().generate_content(prompt)
         sentiment = response.text.strip().lower()
 
         if sentiment not in SENTIMENT_CATEGORIES:
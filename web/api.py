@@ -0,0 +1,364 @@
+"""
+Headless HTTP API for support_pipeline.
+
+Run from the repo root:
+    python -m web.api
+    # or: uvicorn web.api:app --host 0.0.0.0 --port 8000 --timeout-graceful-shutdown 30
+
+Config (env):
+    API_HOST / API_PORT     bind address (default 0.0.0.0:8000)
+    API_WORKERS             pipeline worker threads (default 4)
+    API_MAX_QUEUE           requests allowed to wait for a worker (default 32)
+    API_MAX_BATCH           max queries per /v1/batch call (default 20)
+    API_MAX_UPLOAD_MB       max /v1/image upload size (default 10)
+    API_SHUTDOWN_DELAY      seconds /readyz reports "draining" before the
+                            listener closes, so a load balancer can take
+                            the node out of rotation (default 5)
+    API_DRAIN_TIMEOUT       seconds to let in-flight requests finish once the
+                            listener is closed (default 30)
+    LLM_BACKEND=fake        use the offline fake LLM (for local load tests)
+
+Shutdown: `python -m web.api` handles SIGTERM/SIGINT by flipping /readyz to
+503, serving normally for API_SHUTDOWN_DELAY, then letting uvicorn close the
+listener and wait up to API_DRAIN_TIMEOUT for open requests. Under plain
+`uvicorn web.api:app` there is no readiness flip; uvicorn's
+--timeout-graceful-shutdown is the drain.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import threading
+import traceback
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from pydantic import BaseModel
+
+# Make backend importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import support_pipeline, setup_environment, warm_up_pipeline
+from utils.ocr_utils import extract_text_from_image
+from database.db import get_ticket, get_ticket_messages
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_WORKERS = int(os.getenv("API_WORKERS", "4"))
+API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "32"))
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "20"))
+API_MAX_UPLOAD_BYTES = int(float(os.getenv("API_MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+API_SHUTDOWN_DELAY = float(os.getenv("API_SHUTDOWN_DELAY", "5"))
+API_DRAIN_TIMEOUT = float(os.getenv("API_DRAIN_TIMEOUT", "30"))
+
+UPLOAD_CHUNK = 1024 * 1024
+
+
+class PipelinePool:
+    """
+    Runs blocking pipeline calls on a fixed thread pool.
+
+    At most `workers` calls run at once and `max_queue` more may wait;
+    anything beyond that is shed with 503 instead of piling up.
+    A slot is held until its job actually finishes on the worker thread,
+    even if the request fails or is cancelled first. `pending` is only
+    touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline")
+        self.capacity = workers + max_queue
+        self.pending = 0
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.loop = asyncio.get_running_loop()
+
+    def _reserve(self, slots: int) -> None:
+        if self.pending + slots > self.capacity:
+            raise HTTPException(503, "Server busy, retry later", headers={"Retry-After": "1"})
+        self.pending += slots
+        self.idle.clear()
+
+    def _release(self, slots: int = 1) -> None:
+        self.pending -= slots
+        if self.pending == 0:
+            self.idle.set()
+
+    def _on_job_done(self, _future) -> None:
+        # Runs on the worker thread; hop back to the loop to release
+        try:
+            self.loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed during shutdown
+
+    async def run_many(self, calls: List[tuple]) -> List[Any]:
+        """
+        calls: list of (fn, args, kwargs). Reserves all slots up front so a
+        batch is either admitted whole or rejected. Returns one entry per
+        call: its result, or the exception it raised.
+        """
+        self._reserve(len(calls))
+        futures = []
+        try:
+            for fn, args, kwargs in calls:
+                job = self.executor.submit(fn, *args, **kwargs)
+                job.add_done_callback(self._on_job_done)
+                futures.append(asyncio.wrap_future(job))
+        except Exception:
+            # Slots for jobs that never got submitted
+            self._release(len(calls) - len(futures))
+            raise
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def run(self, fn, *args, **kwargs) -> Any:
+        result = (await self.run_many([(fn, args, kwargs)]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def drain(self, timeout: float) -> None:
+        """
+        Waits for jobs still running on worker threads (e.g. from
+        disconnected clients) before the executor is torn down.
+        """
+        self.draining = True
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            print(f"[API] Drain timed out with {self.pending} job(s) still running.")
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+pool: Optional[PipelinePool] = None
+ready = False
+warm_up_error: Optional[str] = None
+
+
+def _warm_up() -> None:
+    global ready, warm_up_error
+    try:
+        warm_up_pipeline()
+    except Exception as e:
+        warm_up_error = f"{type(e).__name__}: {e}"
+        print(f"[API] Warm-up failed: {warm_up_error}")
+        traceback.print_exc()
+        return
+    ready = True
+    print("[API] Ready.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pool, ready
+    setup_environment()
+    pool = PipelinePool(API_WORKERS, API_MAX_QUEUE)
+
+    # Load models in the background; /readyz reports 503 until done
+    warm_up_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+
+    yield
+
+    # uvicorn has already closed the listener and drained open requests
+    ready = False
+    await pool.drain(API_DRAIN_TIMEOUT)
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+    print("[API] Shutdown complete.")
+
+
+app = FastAPI(title="GenSupport AI API", lifespan=lifespan)
+
+
+# ---------- SCHEMAS ----------
+
+class QueryRequest(BaseModel):
+    query: str
+    language_preference: str = "English"
+    metadata: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    queries: List[QueryRequest]
+
+
+def _require_ready() -> None:
+    if warm_up_error:
+        raise HTTPException(503, f"Warm-up failed: {warm_up_error}")
+    if not ready:
+        raise HTTPException(503, "Models are still loading", headers={"Retry-After": "5"})
+
+
+def _run_query(req: QueryRequest, source_type: str) -> Dict[str, Any]:
+    return support_pipeline(
+        query_text=req.query,
+        source_type=source_type,
+        metadata={**req.metadata, "language_preference": req.language_preference},
+    )
+
+
+def _discard_upload(tmp) -> None:
+    tmp.close()
+    os.remove(tmp.name)
+
+
+async def _save_upload(file: UploadFile, suffix: str) -> str:
+    """
+    Streams the upload to a temp file in chunks (disk I/O off the event
+    loop), rejecting it with 413 once it exceeds API_MAX_UPLOAD_BYTES.
+    """
+    if file.size is not None and file.size > API_MAX_UPLOAD_BYTES:
+        raise HTTPException(413, f"Upload too large (max {API_MAX_UPLOAD_BYTES} bytes)")
+
+    tmp = await asyncio.to_thread(tempfile.NamedTemporaryFile, delete=False, suffix=suffix)
+    size = 0
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK):
+            size += len(chunk)
+            if size > API_MAX_UPLOAD_BYTES:
+                raise HTTPException(413, f"Upload too large (max {API_MAX_UPLOAD_BYTES} bytes)")
+            await asyncio.to_thread(tmp.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(_discard_upload, tmp)
+        raise
+
+    await asyncio.to_thread(tmp.close)
+    return tmp.name
+
+
+def _run_image(image_path: str, language_preference: str) -> Dict[str, Any]:
+    try:
+        extracted = extract_text_from_image(image_path)
+        return support_pipeline(
+            extracted,
+            source_type="image",
+            metadata={"language_preference": language_preference},
+        )
+    finally:
+        os.remove(image_path)
+
+
+# ---------- HEALTH ----------
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    if warm_up_error:
+        raise HTTPException(503, f"Warm-up failed: {warm_up_error}")
+    if pool is not None and pool.draining:
+        raise HTTPException(503, "Draining")
+    if not ready or pool is None:
+        raise HTTPException(503, "Models are still loading")
+    return {"status": "ready", "pending": pool.pending, "capacity": pool.capacity}
+
+
+# ---------- PIPELINE ----------
+
+@app.post("/v1/query")
+async def query(req: QueryRequest):
+    _require_ready()
+    if not req.query.strip():
+        raise HTTPException(400, "Query is empty")
+    return await pool.run(_run_query, req, "api")
+
+
+@app.post("/v1/batch")
+async def batch(req: BatchRequest):
+    _require_ready()
+    if not req.queries:
+        raise HTTPException(400, "No queries given")
+    # A batch must fit in the pool at once, or it could never be admitted
+    max_batch = min(API_MAX_BATCH, pool.capacity)
+    if len(req.queries) > max_batch:
+        raise HTTPException(413, f"Batch too large (max {max_batch})")
+
+    # One failing query doesn't discard the others (they already created tickets)
+    outcomes = await pool.run_many([(_run_query, (q, "api_batch"), {}) for q in req.queries])
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            results.append({"ok": False, "error": f"{type(outcome).__name__}: {outcome}"})
+        else:
+            results.append({"ok": True, "result": outcome})
+    return {"results": results}
+
+
+@app.post("/v1/image")
+async def image(file: UploadFile = File(...), language_preference: str = Form("English")):
+    _require_ready()
+
+    suffix = os.path.splitext(file.filename or "")[1] or ".jpg"
+    img_path = await _save_upload(file, suffix)
+
+    try:
+        return await pool.run(_run_image, img_path, language_preference)
+    except HTTPException:
+        # Shed before reaching a worker, so clean up here
+        os.remove(img_path)
+        raise
+
+
+@app.get("/v1/tickets/{ticket_id}")
+async def ticket(ticket_id: int):
+    record = await asyncio.to_thread(get_ticket, ticket_id)
+    if record is None:
+        raise HTTPException(404, "Ticket not found")
+    record["messages"] = await asyncio.to_thread(get_ticket_messages, ticket_id)
+    return record
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    On the first SIGTERM/SIGINT, flips /readyz to "draining" and keeps
+    serving for API_SHUTDOWN_DELAY before uvicorn closes the listener.
+    A second signal during that delay cuts it short (still a graceful
+    drain); after that, signals get uvicorn's usual handling.
+    """
+
+    def __init__(self, config: uvicorn.Config):
+        super().__init__(config)
+        self._drain_timer: Optional[threading.Timer] = None
+        self._exit_lock = threading.Lock()
+        self._exit_sent = False
+
+    def _exit_once(self, sig, frame) -> None:
+        # Timer and second signal may race; only one reaches uvicorn
+        with self._exit_lock:
+            if self._exit_sent:
+                return
+            self._exit_sent = True
+        super().handle_exit(sig, frame)
+
+    def handle_exit(self, sig, frame) -> None:
+        if self._drain_timer is None and pool is not None and API_SHUTDOWN_DELAY > 0:
+            pool.draining = True
+            print(f"[API] Draining: /readyz is 503, closing listener in {API_SHUTDOWN_DELAY}s.")
+            self._drain_timer = threading.Timer(API_SHUTDOWN_DELAY, self._exit_once, (sig, frame))
+            self._drain_timer.daemon = True
+            self._drain_timer.start()
+            return
+
+        if self._drain_timer is not None:
+            self._drain_timer.cancel()
+        if not self._exit_sent:
+            self._exit_once(sig, frame)
+        else:
+            super().handle_exit(sig, frame)
+
+
+if __name__ == "__main__":
+    config = uvicorn.Config(
+        "web.api:app",
+        host=API_HOST,
+        port=API_PORT,
+        timeout_graceful_shutdown=int(API_DRAIN_TIMEOUT),
+    )
+    DrainingServer(config).run()
@@ -1,14 +1,26 @@
 import streamlit as st
+import pandas as pd
 import os
+import re
 import sys
 import tempfile
 
 # Make backend importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app import support_pipeline
+from app import support_pipeline, setup_environment, warm_up_pipeline
 from utils.ocr_utils import extract_text_from_image
-from database.db import get_all_tickets, get_ticket_messages
+from database.db import (
+    get_all_tickets,
+    get_ticket_messages,
+    get_hourly_trends,
+    get_rollup_breakdown,
+    get_escalation_rates,
+    search_messages,
+    get_change_counter,
+    HIGHLIGHT_START,
+    HIGHLIGHT_END,
+)
 from utils.email_generator import detect_language
 
 
@@ -20,6 +32,157 @@ st.set_page_config(
 
 st.title("🤖 GenSupport AI - Support System")
 
+# ---------- CACHED RESOURCES & QUERIES ----------
+
+@st.cache_resource(show_spinner="🤖 Loading AI models...")
+def load_pipeline_resources():
+    """
+    Runs once per server process: DB setup + embedder, FAISS index,
+    OCR reader and LLM client.
+    """
+    setup_environment()
+    warm_up_pipeline()
+
+
+load_pipeline_resources()
+
+
+# Dashboard queries are keyed by the DB change counter, so any write
+# (new ticket / message) invalidates them on the next run.
+@st.cache_data(max_entries=4)
+def cached_tickets(db_version: int):
+    return get_all_tickets()
+
+
+@st.cache_data(max_entries=4)
+def cached_tickets_df(db_version: int):
+    return pd.DataFrame(cached_tickets(db_version))
+
+
+@st.cache_data(max_entries=256)
+def cached_ticket_messages(ticket_id: int, db_version: int):
+    return get_ticket_messages(ticket_id)
+
+
+@st.cache_data(max_entries=4)
+def cached_hourly_trends(db_version: int):
+    return get_hourly_trends()
+
+
+@st.cache_data(max_entries=16)
+def cached_rollup_breakdown(dimension: str, db_version: int):
+    return get_rollup_breakdown(dimension)
+
+
+@st.cache_data(max_entries=16)
+def cached_escalation_rates(dimension: str, db_version: int):
+    return get_escalation_rates(dimension)
+
+
+@st.cache_data(max_entries=64)
+def cached_search_messages(query: str, limit: int, offset: int, db_version: int):
+    return search_messages(query, limit=limit, offset=offset)
+
+
+# ---------- DASHBOARD FRAGMENTS ----------
+
+SEARCH_PAGE_SIZE = 20
+
+
+def render_snippet(snippet: str) -> str:
+    """
+    Snippet -> safe one-line Markdown: collapse newlines (keeps it inside
+    the blockquote), escape message Markdown, then bold the matched terms.
+    """
+    text = " ".join(snippet.split())
+    text = re.sub(r"([\\`*_{}\[\]()#+\-.!|<>~$:])", r"\\\1", text)
+    return text.replace(HIGHLIGHT_START, "**").replace(HIGHLIGHT_END, "**")
+
+
+def reset_search_page():
+    # A new query starts from the first page of results
+    st.session_state.admin_search_page = 1
+
+
+@st.fragment
+def search_panel():
+    st.markdown("### 🔎 Search Conversations")
+
+    s1, s2 = st.columns([4, 1])
+    with s1:
+        search_query = st.text_input(
+            "Search messages (order number, error text, ...)",
+            key="admin_search_query",
+            on_change=reset_search_page,
+        )
+    with s2:
+        search_page = st.number_input("Page", min_value=1, step=1, key="admin_search_page")
+
+    if search_query.strip():
+        # Fetch one extra row to know whether a next page exists
+        hits = cached_search_messages(
+            search_query,
+            SEARCH_PAGE_SIZE + 1,
+            (search_page - 1) * SEARCH_PAGE_SIZE,
+            get_change_counter(),
+        )
+        has_more = len(hits) > SEARCH_PAGE_SIZE
+        hits = hits[:SEARCH_PAGE_SIZE]
+
+        if not hits:
+            st.write("_No matching messages._")
+        else:
+            for hit in hits:
+                st.markdown(
+                    f"**Ticket #{hit['ticket_id']}** · `{hit['sender']}` · {hit['timestamp']}\n\n"
+                    f"> {render_snippet(hit['snippet'])}"
+                )
+            if has_more:
+                st.caption(f"More results on page {search_page + 1}.")
+
+
+@st.fragment
+def tickets_panel():
+    db_version = get_change_counter()
+    tickets = cached_tickets(db_version)
+
+    if not tickets:
+        st.info("No tickets found yet. Interact with the chat to create some tickets.")
+        return
+
+    col1, col2 = st.columns([2, 3])
+
+    with col1:
+        st.markdown("### All Tickets")
+        st.dataframe(cached_tickets_df(db_version))
+
+        ticket_ids = [t["ticket_id"] for t in tickets]
+        selected_id = st.selectbox("Select Ticket ID", ticket_ids)
+
+    with col2:
+        st.markdown(f"### 🎟 Ticket #{selected_id} Details")
+        ticket = next(t for t in tickets if t["ticket_id"] == selected_id)
+
+        st.markdown(f"**User ID:** `{ticket['user_id']}`")
+        st.markdown(f"**Intent:** `{ticket['intent']}`")
+        st.markdown(f"**Sentiment:** `{ticket['sentiment']}`")
+        st.markdown(f"**Agent Action:** `{ticket['agent_action']}`")
+        st.markdown(f"**Created At:** `{ticket['created_at']}`")
+
+        st.markdown("---")
+        st.markdown("### 💬 Conversation History")
+
+        messages = cached_ticket_messages(selected_id, db_version)
+        if not messages:
+            st.write("_No messages found for this ticket._")
+        else:
+            for msg in messages:
+                role = "user" if msg["sender"] == "user" else "assistant"
+                with st.chat_message(role):
+                    st.markdown(msg["message"])
+                    st.caption(msg["timestamp"])
+
+
 # ---------- SESSION STATE INIT ----------
 
 # Chat history
@@ -156,7 +319,9 @@ if mode == "💬 Chat Support":
         st.warning("🌍 Which language should GenSupport AI reply in?")
 
         detected = st.session_state.detected_lang
-        if "hindi" in detected:
+        if "hinglish" in detected:
+            options = ["Hinglish", "Hindi", "English"]
+        elif "hindi" in detected:
             options = ["Hindi", "Hinglish", "English"]
         else:
             options = ["English", "Hindi", "Hinglish"]
@@ -214,42 +379,48 @@ if mode == "💬 Chat Support":
 elif mode == "📊 Admin Dashboard":
     st.subheader("📊 Admin Dashboard - Tickets & Conversations")
 
-    tickets = get_all_tickets()
+    # ---------- ANALYTICS (served from hourly rollups) ----------
+    st.markdown("### 📈 Ticket Trends")
 
-    if not tickets:
-        st.info("No tickets found yet. Interact with the chat to create some tickets.")
+    db_version = get_change_counter()
+    trends = cached_hourly_trends(db_version)
+    if not trends:
+        st.caption("No tickets yet. Trends appear once the chat creates tickets.")
     else:
-        import pandas as pd
-
-        col1, col2 = st.columns([2, 3])
-
-        with col1:
-            st.markdown("### All Tickets")
-            df = pd.DataFrame(tickets)
-            st.dataframe(df)
-
-            ticket_ids = [t["ticket_id"] for t in tickets]
-            selected_id = st.selectbox("Select Ticket ID", ticket_ids)
-
-        with col2:
-            st.markdown(f"### 🎟 Ticket #{selected_id} Details")
-            ticket = next(t for t in tickets if t["ticket_id"] == selected_id)
-
-            st.markdown(f"**User ID:** `{ticket['user_id']}`")
-            st.markdown(f"**Intent:** `{ticket['intent']}`")
-            st.markdown(f"**Sentiment:** `{ticket['sentiment']}`")
-            st.markdown(f"**Agent Action:** `{ticket['agent_action']}`")
-            st.markdown(f"**Created At:** `{ticket['created_at']}`")
-
-            st.markdown("---")
-            st.markdown("### 💬 Conversation History")
-
-            messages = get_ticket_messages(selected_id)
-            if not messages:
-                st.write("_No messages found for this ticket._")
-            else:
-                for msg in messages:
-                    role = "user" if msg["sender"] == "user" else "assistant"
-                    with st.chat_message(role):
-                        st.markdown(msg["message"])
-                        st.caption(msg["timestamp"])
+        total_tickets = sum(t["tickets"] for t in trends)
+        total_escalations = sum(t["escalations"] for t in trends)
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Total Tickets", total_tickets)
+        m2.metric("Escalations", total_escalations)
+        m3.metric("Escalation Rate", f"{total_escalations / total_tickets:.0%}")
+
+        # Rollup has no rows for empty hours: fill them with zeros so the
+        # chart's time axis is continuous (O(hours in range), not O(tickets))
+        trend_df = pd.DataFrame(trends)
+        trend_df["bucket_hour"] = pd.to_datetime(trend_df["bucket_hour"])
+        trend_df = trend_df.set_index("bucket_hour")
+        full_range = pd.date_range(trend_df.index.min(), trend_df.index.max(), freq="h")
+        trend_df = trend_df.reindex(full_range, fill_value=0)
+        st.line_chart(trend_df[["tickets", "escalations"]])
+        st.line_chart(trend_df[["escalation_rate"]])
+
+        b1, b2, b3 = st.columns(3)
+        for col, dimension in zip((b1, b2, b3), ("intent", "sentiment", "agent_action")):
+            with col:
+                st.markdown(f"**By {dimension.replace('_', ' ').title()}**")
+                breakdown = pd.DataFrame(cached_rollup_breakdown(dimension, db_version))
+                st.bar_chart(breakdown.set_index("value")["tickets"])
+
+        st.markdown("**Escalation Rate by Intent**")
+        rates_df = pd.DataFrame(cached_escalation_rates("intent", db_version)).set_index("value")
+        st.bar_chart(rates_df["escalation_rate"])
+
+    st.markdown("---")
+
+    # Panels below are fragments: their widgets only rerun their own panel
+    search_panel()
+
+    st.markdown("---")
+
+    tickets_panel()